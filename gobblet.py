@@ -1,25 +1,43 @@
 from collections import namedtuple
-from copy import copy, deepcopy
-from functools import total_ordering
+from copy import copy
 import itertools
 import random
 
 
-@total_ordering
 class Size(object):
 
     """Represents the size of a piece."""
 
+    __slots__ = ('name', 'value')
+
     def __init__(self, name, value):
         self.name = name
         self.value = value
 
+    # All comparisons are written out, rather than generated by
+    # functools.total_ordering, since they're on the hot path of move
+    # validation and total_ordering's wrappers add a call per comparison.
     def __eq__(self, other):
         return isinstance(other, Size) and self.value == other.value
 
+    def __ne__(self, other):
+        return not (isinstance(other, Size) and self.value == other.value)
+
     def __lt__(self, other):
         return self.value < other.value
 
+    def __le__(self, other):
+        return self.value <= other.value
+
+    def __gt__(self, other):
+        return self.value > other.value
+
+    def __ge__(self, other):
+        return self.value >= other.value
+
+    def __hash__(self):
+        return hash(self.value)
+
     def __repr__(self):
         return 'Size({}, {})'.format(self.name, self.value)
         
@@ -34,9 +52,36 @@ class Sizes:
 
 
 class Piece(object):
+
+    """
+    A player's piece. Pieces are immutable, so they can be handed to
+    player algorithms without copying: copy() and deepcopy() return
+    the piece itself.
+    """
+
+    __slots__ = ('player', 'size')
+
     def __init__(self, player, size):
-        self.player = player
-        self.size = size
+        object.__setattr__(self, 'player', player)
+        object.__setattr__(self, 'size', size)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Can't set attribute, pieces are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Can't delete attribute, pieces are immutable")
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return Piece, (self.player, self.size)
+
+    def __repr__(self):
+        return 'Piece({!r}, {!r})'.format(self.player, self.size)
 
 
 class Stack(object):
@@ -50,8 +95,10 @@ class Stack(object):
     to the top of a stack with stack.push(piece).
     """
 
-    def __init__(self, pieces=None):
+    def __init__(self, pieces=None, on_change=None):
         self.pieces = pieces or []
+        # Optional callback, called with the stack whenever its top changes.
+        self.on_change = on_change
 
     def __len__(self):
         return len(self.pieces)
@@ -72,9 +119,16 @@ class Stack(object):
             raise ValueError(m)
 
         self.pieces.append(piece)
+        self._changed()
 
     def pop(self):
-        return self.pieces.pop()
+        piece = self.pieces.pop()
+        self._changed()
+        return piece
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change(self)
 
 
 class NoSuchPiece(Exception): pass
@@ -89,74 +143,305 @@ class Dugout(object):
     dugout onto the board.
     """
 
+    NoSuchPiece = NoSuchPiece
+
     def __init__(self, stacks):
         self.stacks = stacks
 
+        # The available pieces, and a map from each of them to its stack,
+        # are cached until one of the stacks changes.
+        self._available = None
+        self._stack_by_top = None
+        self._invalidate()
+
     def __copy__(self):
         stacks = list(copy(stack) for stack in self.stacks)
         return Dugout(stacks)
 
+    def _stack_changed(self, stack):
+        self._available = None
+        self._stack_by_top = None
+
+    def _invalidate(self):
+        """
+        Drop the cached available pieces. Stack changes do this already,
+        but code which replaces items of "stacks" must call this,
+        which also watches the new stacks for changes.
+        """
+        for stack in self.stacks:
+            stack.on_change = self._stack_changed
+        self._stack_changed(None)
+
+    def _refresh(self):
+        if self._available is None:
+            stacks = [stack for stack in self.stacks if stack]
+            self._available = tuple(stack.top() for stack in stacks)
+            self._stack_by_top = dict((stack.top(), stack) for stack in stacks)
+
     @property
     def available(self):
-        available = []
-        for stack in self.stacks:
-            try:
-                available.append(stack.top())
-            except IndexError:
-                pass
-        return available
+        """The pieces on top of each stack, as a tuple."""
+        self._refresh()
+        return self._available
+
+    def use_piece(self, piece):
+        """
+        Pop the given piece off the top of its stack.
+        Raises NoSuchPiece if the piece isn't on top of any stack.
+        """
+        self._refresh()
+        try:
+            stack = self._stack_by_top[piece]
+        except (KeyError, TypeError):
+            raise NoSuchPiece(piece)
+
+        # Never trust the index to pop some other piece
+        if not stack or stack.top() is not piece:
+            raise NoSuchPiece(piece)
+        return stack.pop()
+
+
+def win_lines(size):
+    """
+    Return the (row, col) keys of the cells in each winning line
+    of a square board: each row, each column, and the two diagonals.
+    """
+    lines = []
+    for i in range(size):
+        lines.append(tuple((i, col) for col in range(size)))
+        lines.append(tuple((row, i) for row in range(size)))
+    lines.append(tuple((i, i) for i in range(size)))
+    lines.append(tuple((i, size - i - 1) for i in range(size)))
+    return tuple(lines)
+
+
+def win_masks(size):
+    """
+    Return the bitmasks of the winning lines of a square board,
+    in the same order as win_lines().
+
+    Cell (row, col) is bit "row * size + col".
+    """
+    return tuple(sum(1 << (row * size + col) for row, col in line)
+                 for line in win_lines(size))
+
+
+def find_winner(top_owners, is_win):
+    """
+    Return the player whose bitboard passes the "is_win" check, or None.
+    This only deals with plain ints, no Stack or Piece lookups.
+    """
+    for player, owned in top_owners.items():
+        if player and is_win(owned):
+            return player
 
 
 class Board(object):
 
+    # Generated win checkers and cell keys, keyed by board size.
+    _win_checkers = {}
+    _keys_by_size = {}
+
     def __init__(self, size):
         self.size = size
-        # Create a square board with "size" columns and rows,
-        # where each cell is a list.
-        self.cells = []
-        for row_i in range(size):
-            row = []
-            self.cells.append(row)
+        self.is_win = self._compile_win_checker(size)
+
+        # Bitboards of the cells where each player's piece is on top,
+        # keyed by player. These are brought up to date lazily:
+        # a stack change only marks its cell's bit in "_dirty".
+        self._top_owners = {}
+        self._dirty = 0
+
+        # The winner found by the last check, which stays valid
+        # until the bitboards change.
+        self._winner = None
+        self._winner_checked = False
+
+        # The stacks are stored in one flat, row-major list,
+        # so cell (row, col) is "_stacks[row * size + col]".
+        self._keys = self._cell_keys(size)
+        self._stacks = [Stack() for key in self._keys]
+
+        # The new stacks are empty, same as the bitboards,
+        # so unlike _set_cell() there's nothing to mark dirty.
+        for index, stack in enumerate(self._stacks):
+            stack.on_change = self._cell_watcher(1 << index)
+
+        self._rows = self._build_rows()
+
+    @classmethod
+    def _cell_keys(cls, size):
+        """The (row, col) key of every cell, in row-major order."""
+        try:
+            return cls._keys_by_size[size]
+        except KeyError:
+            keys = cls._keys_by_size[size] = tuple(divmod(i, size)
+                                                   for i in range(size * size))
+            return keys
+
+    @classmethod
+    def _compile_win_checker(cls, size):
+        """
+        Return a function which tells whether a bitboard covers a winning line.
+
+        The function is generated for the given board size, with the masks
+        inlined as constants. Rather than testing each row and column
+        separately, it ANDs the bitboard with shifted copies of itself,
+        which tests every row (or every column) at once. For a 4x4 board:
+
+            def is_win(owned):
+                rows = owned & owned >> 1 & owned >> 2 & owned >> 3
+                cols = owned & owned >> 4 & owned >> 8 & owned >> 12
+                return bool(rows & 4369 or cols & 15 or
+                            owned & 33825 == 33825 or owned & 4680 == 4680)
+        """
+        try:
+            return cls._win_checkers[size]
+        except KeyError:
+            pass
+
+        masks = win_masks(size)
+        first_row, first_col = masks[0], masks[1]
+        diagonals = masks[-2:]
+
+        def shifted_and(step):
+            return ' & '.join(['owned'] + ['owned >> {}'.format(i * step)
+                                           for i in range(1, size)])
+
+        # After the shifted ANDs, the bit of a row's first cell is set
+        # only if the whole row is, and likewise for a column's first cell.
+        tests = ['rows & {}'.format(first_col), 'cols & {}'.format(first_row)]
+        tests += ['owned & {0} == {0}'.format(mask) for mask in diagonals]
+
+        source = ('def is_win(owned):\n'
+                  '    rows = {}\n'
+                  '    cols = {}\n'
+                  '    return bool({})\n').format(shifted_and(1),
+                                                 shifted_and(size),
+                                                 ' or '.join(tests))
+
+        namespace = {}
+        exec(source, namespace)
+        is_win = cls._win_checkers[size] = namespace['is_win']
+        return is_win
+
+    def _cell_watcher(self, bit):
+        def on_change(stack):
+            self._dirty |= bit
+        return on_change
+
+    def _set_cell(self, key, stack):
+        row, col = key
+        index = row * self.size + col
+
+        stack.on_change = self._cell_watcher(1 << index)
+        self._stacks[index] = stack
+        self._rows = self._build_rows()
+        stack.on_change(stack)
 
-            for col_i in range(size):
-                stack = Stack()
-                row.append(stack)
+    def _build_rows(self):
+        size = self.size
+        stacks = self._stacks
+        return tuple(tuple(stacks[i:i + size])
+                     for i in range(0, size * size, size))
+
+    @property
+    def cells(self):
+        """
+        The stacks as a tuple of rows, e.g. board.cells[row][col].
+        This is a read-only view; the board's stacks can't be replaced.
+        """
+        return self._rows
 
     def __getitem__(self, key):
         row, col = key
-        return self.cells[row][col]
+        size = self.size
+        if not (0 <= row < size and 0 <= col < size):
+            raise IndexError('Board index out of range: {}'.format(key))
+        return self._stacks[row * size + col]
+
+    def push_many(self, keys, piece):
+        """Push the same piece on to the stack of each of the given cells."""
+        # Look up every cell first, so a bad key leaves the board untouched.
+        for stack in [self[key] for key in keys]:
+            stack.push(piece)
 
     def __copy__(self):
         board = Board(self.size)
         for key, cell in self:
-            row, col = key
-            board.cells[row][col] = copy(cell)
+            board._set_cell(key, copy(cell))
         return board
 
     def __iter__(self):
-        for row_i, row in enumerate(self.cells):
-            for col_i, cell in enumerate(row):
-                yield (row_i, col_i), cell
+        return iter(zip(self._keys, self._stacks))
 
     @property
     def available(self):
-        available = []
-        for row in self.cells:
-            for cell in row:
-                if cell:
-                    available.append(cell.top())
-        return available
+        return [cell.top() for cell in self._stacks if cell]
+
+    def get_row(self, row):
+        return self._stacks[row * self.size:(row + 1) * self.size]
 
     def get_column(self, col):
-        return [self.cells[row][col] for row in range(self.size)]
+        return self._stacks[col::self.size]
+
+    def get_diagonal_a(self):
+        """The diagonal from (0, 0) to (size - 1, size - 1)."""
+        return self._stacks[::self.size + 1]
+
+    def get_diagonal_b(self):
+        """The diagonal from (0, size - 1) to (size - 1, 0)."""
+        size = self.size
+        return self._stacks[size - 1:size * size - size + 1:max(size - 1, 1)]
+
+    @property
+    def top_owners(self):
+        """
+        Map each player to a bitmask of the cells where
+        that player's piece is on top of the stack.
+        """
+        dirty = self._dirty
+        if dirty:
+            self._dirty = 0
+            self._winner_checked = False
+            owners = self._top_owners
+
+            while dirty:
+                bit = dirty & -dirty
+                dirty ^= bit
+
+                for player in owners:
+                    owners[player] &= ~bit
+
+                cell = self._stacks[bit.bit_length() - 1]
+                if cell:
+                    player = cell.top().player
+                    owners[player] = owners.get(player, 0) | bit
+
+        return self._top_owners
+
+    @property
+    def winner(self):
+        """
+        The player whose pieces are on top of a whole row, column,
+        or diagonal, or None. Checking again without any stack changes
+        in between returns the previous result.
+        """
+        owners = self.top_owners
+        if not self._winner_checked:
+            self._winner = find_winner(owners, self.is_win)
+            self._winner_checked = True
+        return self._winner
 
     def find(self, piece):
         for key, cell in self:
-            try:
-                if cell.top() is piece:
-                    return key
-            except IndexError:
-                pass
+            if cell and cell.top() is piece:
+                return key
+
+
+# What a player algorithm returns for its turn.
+# A plain (piece, dest) tuple works just as well.
+Move = namedtuple('Move', 'piece dest')
 
 
 class Player(object):
@@ -219,8 +504,9 @@ class Game(object):
         #      (what I really wanted was board.cells[0][0][-1])
         #      make the API easier, but also give more informative errors
         #      such as "You didn't return a piece"
-        if (piece not in dugout.available and
-            piece not in self.board.available):
+        # Look the piece up on the board once, and reuse the position below.
+        source_pos = self.board.find(piece)
+        if source_pos is None and piece not in dugout.available:
             raise InvalidMove("Source piece is not available")
 
         try:
@@ -228,8 +514,6 @@ class Game(object):
         except IndexError:
             raise InvalidMove("Invalid destination")
 
-        source_pos = self.board.find(piece)
-
         if source_pos and source_pos == dest:
             raise InvalidMove("Cannot move a piece to the same cell")
 
@@ -238,63 +522,12 @@ class Game(object):
             
 
     def _check_win(self, board):
-
-        def check_cells(cells):
-            players = []
-            for cell in cells:
-                if cell:
-                    players.append(cell.top().player)
-                else:
-                    players.append(None)
-                
-            first = players[0]
-            # Compare every cell after the first with the first cell
-            # If they are all the same as the first, they'll all be True,
-            # so all() will return True, meaning it's a win.
-            if first and all(player == first for player in players):
-                return first
-
-        def gen_cells_to_check():
-            # Generate the groups of cells that need to be checked:
-            # each row, each column, and the two diagonals.
-            diagonal_a = []
-            diagonal_b = []
-
-            for i in range(board.size):
-                # Rows
-                yield board.cells[i]
-                # Columns
-                yield board.get_column(i)
-
-                diagonal_a.append(board[i, i])
-
-                row = board.size - i - 1
-                col = i
-                diagonal_b.append(board[row, col])
-
-            # The two diagonals
-            yield diagonal_a
-            yield diagonal_b
-
-        for cells in gen_cells_to_check():
-            winner = check_cells(cells)
-            if winner:
-                return winner
-
-    def _use_piece(self, dugout, piece):
-        for stack in dugout.stacks:
-            try:
-                if stack.top() == piece:
-                    return stack.pop()
-            except IndexError:
-                pass
-
-        raise NoSuchPiece(piece)
+        return board.winner
 
     def _commit(self, player, dugout, piece, dest):
 
         try:
-            self._use_piece(dugout, piece)
+            dugout.use_piece(piece)
         except NoSuchPiece:
             pos = self.board.find(piece)
             self.board[pos].pop()
@@ -345,6 +578,11 @@ def create_stacks(player, sizes, num_stacks):
     #
     # Pieces must be accessed in order, from largest to smallest,
     # i.e. popped off each stack.
+    #
+    # Every piece is a separate object, even when the player and size match.
+    # Pieces look alike, but a move names its piece by identity, which is how
+    # Board.find() tells which cell the piece is moved from, so pieces must
+    # not be shared between stacks.
     stacks = []
     for stack_i in xrange(num_stacks):
         pieces = [Piece(player, size) for size in sizes]
@@ -370,7 +608,7 @@ class RandomPlayer(Player):
             while len(board[dest]) and board[dest].top().size >= piece.size:
                 dest = self._random_cell(board)
                 
-            return piece, dest
+            return Move(piece, dest)
 
         else:
             src = self._random_cell(board)
@@ -383,7 +621,7 @@ class RandomPlayer(Player):
             while len(board[dest]) and board[dest].top().size >= piece.size:
                 dest = self._random_cell(board)
 
-            return piece, dest
+            return Move(piece, dest)
 
 
 class MoveTreeNode(object):
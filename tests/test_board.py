@@ -17,6 +17,22 @@ class BoardTestCase(unittest.TestCase):
         self.assertEqual(type(board[0, 0]), gobblet.Stack)
         self.assertEqual(len(board[0, 0]), 0)
 
+    def test_cells_read_only(self):
+        board = gobblet.Board(4)
+
+        with self.assertRaises(TypeError):
+            board.cells[1][1] = gobblet.Stack()
+
+        with self.assertRaises(AttributeError):
+            board.cells = []
+
+    def test_getitem_out_of_range(self):
+        board = gobblet.Board(4)
+
+        for key in [(4, 0), (0, 4), (-1, 0), (0, -1)]:
+            with self.assertRaises(IndexError):
+                board[key]
+
     def test_get_column(self):
         board = gobblet.Board(4)
         board[0, 1].push('foo')
@@ -27,6 +43,28 @@ class BoardTestCase(unittest.TestCase):
         self.assertEqual(col[2].pieces, [])
         self.assertEqual(col[3].pieces, ['bar'])
 
+    def test_get_row(self):
+        board = gobblet.Board(4)
+        board[1, 0].push('foo')
+        board[1, 3].push('bar')
+        row = board.get_row(1)
+        self.assertEqual([cell.pieces for cell in row],
+                         [['foo'], [], [], ['bar']])
+
+    def test_get_diagonals(self):
+        board = gobblet.Board(4)
+        for i in range(4):
+            board[i, i].push(('a', i))
+            board[i, 3 - i].push(('b', i))
+
+        diagonal_a = board.get_diagonal_a()
+        self.assertEqual([cell.top() for cell in diagonal_a],
+                         [('a', 0), ('a', 1), ('a', 2), ('a', 3)])
+
+        diagonal_b = board.get_diagonal_b()
+        self.assertEqual([cell.top() for cell in diagonal_b],
+                         [('b', 0), ('b', 1), ('b', 2), ('b', 3)])
+
     def test_getitem(self):
         board = gobblet.Board(4)
         board.cells[0][1].push('foo')
@@ -50,6 +88,74 @@ class BoardTestCase(unittest.TestCase):
             [[], [], [], []],
         ])
 
+    def test_push_many(self):
+        board = gobblet.Board(4)
+        board.push_many([(0, 0), (1, 2), (3, 3)], 'foo')
+
+        pieces = [[cell.pieces for cell in row] for row in board.cells]
+        self.assertEqual(pieces, [
+            [['foo'], [], [], []],
+            [[], [], ['foo'], []],
+            [[], [], [], []],
+            [[], [], [], ['foo']],
+        ])
+
+    def test_push_many_out_of_range(self):
+        board = gobblet.Board(4)
+
+        with self.assertRaises(IndexError):
+            board.push_many([(0, 0), (0, 4)], 'foo')
+
+        self.assertEqual(board.available, [])
+
+    def test_top_owners(self):
+        board = gobblet.Board(4)
+        white_small = gobblet.Piece('white', gobblet.Sizes.sm)
+        white_large = gobblet.Piece('white', gobblet.Sizes.lg)
+        black_small = gobblet.Piece('black', gobblet.Sizes.sm)
+
+        board[0, 1].push(white_large)
+        board[2, 3].push(white_small)
+        self.assertEqual(board.top_owners, {'white': 0b100000000010})
+
+        # Black covers white's piece at (0, 1)
+        board[0, 1].push(black_small)
+        self.assertEqual(board.top_owners, {
+            'white': 0b100000000000,
+            'black': 0b10,
+        })
+
+        # Black lifts the piece back up, revealing white's piece
+        board[0, 1].pop()
+        self.assertEqual(board.top_owners, {
+            'white': 0b100000000010,
+            'black': 0,
+        })
+
+    def test_winner(self):
+        board = gobblet.Board(4)
+        pieces = [gobblet.Piece('white', gobblet.Sizes.lg) for i in range(4)]
+        self.assertIsNone(board.winner)
+
+        for i, piece in enumerate(pieces):
+            board[i, 2].push(piece)
+        self.assertEqual(board.winner, 'white')
+        self.assertEqual(board.winner, 'white')
+
+        board[3, 2].push(gobblet.Piece('black', gobblet.Sizes.sm))
+        self.assertIsNone(board.winner)
+
+    def test_is_win(self):
+        board = gobblet.Board(4)
+
+        for mask in gobblet.win_masks(4):
+            self.assertTrue(board.is_win(mask))
+            # Every line needs all four of its cells
+            self.assertFalse(board.is_win(mask & (mask - 1)))
+
+        self.assertFalse(board.is_win(0))
+        self.assertTrue(board.is_win(0xFFFF))
+
 
 if __name__ == '__main__':
     unittest.main()
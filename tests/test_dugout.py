@@ -1,4 +1,4 @@
-from copy import deepcopy
+from operator import attrgetter
 import unittest
 
 import gobblet
@@ -14,10 +14,9 @@ class DugoutTestCase(unittest.TestCase):
         self.dugout = gobblet.Dugout(stacks)
 
     def assertPieces(self, pieces, expected):
-        for piece, expect in zip(pieces, expected):
-            player, size = expect
-            self.assertEqual(piece.player, player)
-            self.assertEqual(piece.size, size)
+        # Compare whole lists, so a missing or extra piece fails too.
+        self.assertEqual(list(map(attrgetter('player', 'size'), pieces)),
+                         expected)
 
     def test_init(self):
         expected_stack = [
@@ -30,6 +29,12 @@ class DugoutTestCase(unittest.TestCase):
         self.assertPieces(self.dugout.stacks[0], expected_stack)
         self.assertPieces(self.dugout.stacks[1], expected_stack)
 
+    def test_pieces_are_distinct(self):
+        a = self.dugout.stacks[0].top()
+        b = self.dugout.stacks[1].top()
+        self.assertEqual(a.size, b.size)
+        self.assertIsNot(a, b)
+
     def test_available_pieces(self):
         expected_pieces = [
             ('sally', gobblet.Sizes.xl),
@@ -45,6 +50,32 @@ class DugoutTestCase(unittest.TestCase):
         ]
         self.assertPieces(self.dugout.available, expected_pieces)
 
+    def test_available_pieces_cached(self):
+        available = self.dugout.available
+        self.assertIs(self.dugout.available, available)
+
+        # Changing a stack drops the cached pieces
+        self.dugout.stacks[0].pop()
+        self.assertIsNot(self.dugout.available, available)
+        self.assertEqual(len(self.dugout.available), 2)
+
+    def test_replaced_stack(self):
+        small, extra_small = self.dugout.stacks[0][1], self.dugout.stacks[0][0]
+        self.dugout.stacks[0] = gobblet.Stack([extra_small, small])
+        self.dugout._invalidate()
+
+        self.assertIs(self.dugout.use_piece(small), small)
+
+        # The replaced stack is watched, so the cache follows its changes
+        expected_pieces = [
+            ('sally', gobblet.Sizes.xs),
+            ('sally', gobblet.Sizes.xl),
+        ]
+        self.assertPieces(self.dugout.available, expected_pieces)
+
+        with self.assertRaises(self.dugout.NoSuchPiece):
+            self.dugout.use_piece(small)
+
     def test_use_piece(self):
         piece = self.dugout.available[0]
         self.dugout.use_piece(piece)
@@ -65,6 +96,7 @@ class DugoutTestCase(unittest.TestCase):
         self.assertPieces(self.dugout.available, expected_pieces)
 
         self.dugout.stacks[0] = gobblet.Stack()
+        self.dugout._invalidate()
 
         expected_pieces = [
             ('sally', gobblet.Sizes.lg),
@@ -78,6 +110,21 @@ class DugoutTestCase(unittest.TestCase):
         with self.assertRaises(self.dugout.NoSuchPiece):
             self.dugout.use_piece(piece)
 
+        # Unhashable values can't be pieces either
+        with self.assertRaises(self.dugout.NoSuchPiece):
+            self.dugout.use_piece([])
+
+    def test_use_piece_stale_index(self):
+        piece = self.dugout.available[0]
+
+        # Change a stack behind the dugout's back, without the hook
+        self.dugout.stacks[0].on_change = None
+        self.dugout.stacks[0].pop()
+
+        with self.assertRaises(self.dugout.NoSuchPiece):
+            self.dugout.use_piece(piece)
+        self.assertEqual(len(self.dugout.stacks[0]), 3)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,4 +1,3 @@
-from collections import namedtuple
 from copy import copy
 import unittest
 
@@ -81,7 +80,7 @@ class GameTestCase(unittest.TestCase):
         game = gobblet.Game(Mock(), Mock())
 
         for x in range(game.board.size):
-            piece = game.white.dugout.available.pop()
+            piece = game.white.dugout.available[-1]
             game.white.dugout.use_piece(piece)
             game.board[0, x].push(piece)
 
@@ -91,7 +90,7 @@ class GameTestCase(unittest.TestCase):
         game = gobblet.Game(Mock(), Mock())
 
         for x in range(game.board.size):
-            piece = game.white.dugout.available.pop()
+            piece = game.white.dugout.available[-1]
             game.white.dugout.use_piece(piece)
             game.board[x, 0].push(piece)
 
@@ -102,10 +101,7 @@ class GameTestCase(unittest.TestCase):
         board = game.board
         piece = game.white.dugout.available[0]
 
-        board[0, 0].push(piece)
-        board[1, 1].push(piece)
-        board[2, 2].push(piece)
-        board[3, 3].push(piece)
+        board.push_many([(0, 0), (1, 1), (2, 2), (3, 3)], piece)
 
         self.assertTrue(game._check_win(board))
 
@@ -114,10 +110,7 @@ class GameTestCase(unittest.TestCase):
         board = game.board
         piece = game.white.dugout.available[0]
 
-        board[0, 3].push(piece)
-        board[1, 2].push(piece)
-        board[2, 1].push(piece)
-        board[3, 0].push(piece)
+        board.push_many([(0, 3), (1, 2), (2, 1), (3, 0)], piece)
 
         self.assertTrue(game._check_win(board))
 
@@ -129,9 +122,7 @@ class GameTestCase(unittest.TestCase):
 
         self.assertFalse(game._check_win(board))
 
-        board[0, 0].push(piece)
-        board[0, 1].push(piece)
-        board[0, 2].push(piece)
+        board.push_many([(0, 0), (0, 1), (0, 2)], piece)
 
         piece = game.black.dugout.available[0]
         board[0, 3].push(piece)
@@ -181,6 +172,13 @@ class GameTestCase(unittest.TestCase):
 class InvalidTestCase(unittest.TestCase):
     """Test cases where the player algorithm returns an invalid move"""
 
+    def assertInvalidMove(self, game, message):
+        # The messages are plain text, so check for a substring
+        # rather than matching them as regular expressions.
+        with self.assertRaises(gobblet.InvalidMove) as cm:
+            game.tick()
+        self.assertIn(message, str(cm.exception))
+
     def test_bad_return_value(self):
         pass
 
@@ -190,9 +188,7 @@ class InvalidTestCase(unittest.TestCase):
 
         game = gobblet.Game(alg, Mock())
 
-        regexp = 'Must provide a source piece'
-        with self.assertRaisesRegexp(gobblet.InvalidMove, regexp):
-            game.tick()
+        self.assertInvalidMove(game, 'Must provide a source piece')
 
     def test_destination_is_None(self):
         def alg(board, dugout):
@@ -200,9 +196,7 @@ class InvalidTestCase(unittest.TestCase):
 
         game = gobblet.Game(alg, Mock())
 
-        regexp = 'Must provide a destination'
-        with self.assertRaisesRegexp(gobblet.InvalidMove, regexp):
-            game.tick()
+        self.assertInvalidMove(game, 'Must provide a destination')
 
     def test_destination_out_of_bounds(self):
         def alg(board, dugout):
@@ -210,9 +204,7 @@ class InvalidTestCase(unittest.TestCase):
 
         game = gobblet.Game(alg, Mock())
 
-        regexp = 'Invalid destination'
-        with self.assertRaisesRegexp(gobblet.InvalidMove, regexp):
-            game.tick()
+        self.assertInvalidMove(game, 'Invalid destination')
 
     def test_move_piece_to_same_cell(self):
         def alg(board, dugout):
@@ -225,9 +217,7 @@ class InvalidTestCase(unittest.TestCase):
         piece = game.white.dugout.stacks[0].pop()
         game.board[0, 0].push(piece)
 
-        regexp = "Cannot move a piece to the same cell"
-        with self.assertRaisesRegexp(gobblet.InvalidMove, regexp):
-            game.tick()
+        self.assertInvalidMove(game, "Cannot move a piece to the same cell")
 
     def test_cover_piece_of_equal_or_larger_size(self):
         def alg(board, dugout):
@@ -245,9 +235,8 @@ class InvalidTestCase(unittest.TestCase):
         piece = game.white.dugout.stacks[0].pop()
         game.board[0, 0].push(piece)
 
-        regexp = "Can't cover a piece of equal or larger size"
-        with self.assertRaisesRegexp(gobblet.InvalidMove, regexp):
-            game.tick()
+        self.assertInvalidMove(game,
+                               "Can't cover a piece of equal or larger size")
 
     def test_dugout_source_piece_not_available(self):
         def alg(board, dugout):
@@ -258,9 +247,7 @@ class InvalidTestCase(unittest.TestCase):
 
         game = gobblet.Game(alg, Mock())
 
-        regexp = 'Source piece is not available'
-        with self.assertRaisesRegexp(gobblet.InvalidMove, regexp):
-            game.tick()
+        self.assertInvalidMove(game, 'Source piece is not available')
 
     def test_move_other_players_piece(self):
         piece = None
@@ -273,9 +260,7 @@ class InvalidTestCase(unittest.TestCase):
 
         piece = game.black.dugout.available[0]
 
-        regexp = 'Source piece is not available'
-        with self.assertRaisesRegexp(gobblet.InvalidMove, regexp):
-            game.tick()
+        self.assertInvalidMove(game, 'Source piece is not available')
 
 
 class SimulationTestCase(unittest.TestCase):
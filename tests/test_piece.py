@@ -1,3 +1,4 @@
+from copy import copy, deepcopy
 import unittest
 
 import gobblet
@@ -14,6 +15,41 @@ class PieceTestCase(unittest.TestCase):
         self.assertTrue(large.size > small.size)
         self.assertTrue(small.size < large.size)
 
+    def test_size_comparisons(self):
+        small = gobblet.Sizes.sm
+        large = gobblet.Sizes.lg
+        large_2 = gobblet.Size('also large', 2)
+
+        self.assertTrue(large == large_2)
+        self.assertFalse(large != large_2)
+        self.assertTrue(small != large)
+        self.assertTrue(small <= large)
+        self.assertTrue(large <= large_2)
+        self.assertTrue(large >= large_2)
+        self.assertFalse(small >= large)
+        self.assertEqual(hash(large), hash(large_2))
+        self.assertNotEqual(large, 2)
+
+
+class ImmutablePieceTestCase(unittest.TestCase):
+
+    def test_immutable(self):
+        piece = gobblet.Piece('player', gobblet.Sizes.lg)
+
+        with self.assertRaises(AttributeError):
+            piece.size = gobblet.Sizes.xl
+
+        with self.assertRaises(AttributeError):
+            del piece.player
+
+        self.assertEqual(piece.player, 'player')
+        self.assertEqual(piece.size, gobblet.Sizes.lg)
+
+    def test_copy(self):
+        piece = gobblet.Piece('player', gobblet.Sizes.lg)
+        self.assertIs(copy(piece), piece)
+        self.assertIs(deepcopy(piece), piece)
+
 
 if __name__ == '__main__':
     unittest.main()